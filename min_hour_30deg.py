@@ -3,7 +3,9 @@ Usage:
 
   [rm min_hour_clock.bsp]
 
-  python min_hour_30deg.py [--debug] [other kernels]
+  python min_hour_30deg.py [--debug] [--strict] [other kernels]
+
+  --strict implies --debug
 
 The Python script, min_hour_30deg.py, uses the SpiceyPy package to simulate a
 clock using three synthetic bodies: a central body; two bodies orbiting the
@@ -42,6 +44,12 @@ synthetic trajectories of the MINUTE and HOUR
 """
 import os
 import sys
+import json
+import math
+import ctypes
+import hashlib
+
+import numpy as np
 
 ### SpiceyPy Python module provides an interface to the JPL/NAIF SPICE
 ### toolkit cf. http://naif.jpl.nasa.gov/. cf.
@@ -54,69 +62,253 @@ import sys
 
 import spiceypy as sp
 
+### Numba is opt-in:  set MIN_HOUR_30DEG_NUMBA=1 to compile the analytic
+### event solver, and a parallel half-hour validator that is used for
+### long sweeps; cache=True keeps the compiled code in __pycache__/
+### between runs.  At this script's own sizes the Numba import and JIT
+### cost far exceed the arithmetic, so by default the NumPy versions run,
+### and Numba is only worth enabling for callers making many, or large,
+### queries
+useNumba = os.environ.get('MIN_HOUR_30DEG_NUMBA', '') not in ('', '0')
+if useNumba:
+  from numba import njit, prange
+
+
+########################################################################
+### NumPy equivalents of SPICE VHAT and VSEP, applied along the last
+### axis so they work on a single 3-vector or on an Nx3 array of them;
+### these avoid a Python=>CSPICE call per vector for trivial arithmetic
+
+def _hat(v):
+  return v / np.linalg.norm(v, axis=-1, keepdims=True)
+
+def _vsep(a, b):
+  ### Same well-conditioned formulation as VSEP:  2*asin(|a-b|/2) when
+  ### the vectors are within 90deg, else pi - 2*asin(|a+b|/2); arccos of
+  ### the dot product loses ~1e-8 rad near 0deg
+  aHat, bHat = _hat(a), _hat(b)
+  return np.where(np.sum(aHat * bHat, axis=-1) > 0.0
+                 , 2.0 * np.arcsin(np.linalg.norm(aHat - bHat, axis=-1) / 2.0)
+                 , np.pi - 2.0 * np.arcsin(np.linalg.norm(aHat + bHat, axis=-1) / 2.0)
+                 )
+
+
+########################################################################
+def check_passes(posMinutes, posHours, degPerHour, xTol):
+  ### Return the count of half-hour passes, at ET0 + i half hours, where
+  ### the Nx3 MINUTE and HOUR positions fail the clock checks:
+  ### - the minute hand is along +X on the hour (even i), and along -X
+  ###   on the half hour (odd i)
+  ### - on the hour, the angle between the hands is degPerHour * (i / 2)
+  ###   (or 360 minus that), modulo 360
+  iPasses = np.arange(posMinutes.shape[0])
+
+  ### On the hour, the minute hand will be at RA=0, at [+1,0,0]
+  ### On the half hour, the minute hand will be at RA=180, along [-1,0,0]
+  mExpects = np.where((iPasses & 1)[:,None], [-1.0,0.,0.], [1.0,0.,0.])
+  isBad = ~(np.linalg.norm(mExpects - _hat(posMinutes), axis=1) < xTol)
+
+  ### Separation angles between the hands, on the hour
+  vsepDegs = (180.0 / math.pi) * _vsep(posHours[::2], posMinutes[::2])
+  vsepExpectDegs = (degPerHour * (iPasses[::2]>>1)) % 360.0
+  isBad[::2] |= ~((np.abs(vsepDegs - vsepExpectDegs) < xTol)
+                 | (np.abs(360.0 - vsepDegs - vsepExpectDegs) < xTol))
+
+  return int(np.count_nonzero(isBad))
+
+### With Numba enabled, check_passes_parallel is a compiled, parallel,
+### scalar equivalent of check_passes for long sweeps; its thread-pool
+### start-up only pays off for many thousands of passes, so
+### check_passes_any uses it from nParallelMinPasses passes on
+nParallelMinPasses = 10000
+
+if useNumba:
+  @njit(parallel=True, cache=True)
+  def check_passes_parallel(posMinutes, posHours, degPerHour, xTol):
+    ### Passes are independent, so they run in parallel
+    nBad = 0
+    for i in prange(posMinutes.shape[0]):
+
+      ### Unit vector from CLOCK toward MINUTE, and its distance from +/-X
+      mx, my, mz = posMinutes[i,0], posMinutes[i,1], posMinutes[i,2]
+      mNorm = math.sqrt(mx*mx + my*my + mz*mz)
+      mx, my, mz = mx/mNorm, my/mNorm, mz/mNorm
+      xExpect = -1.0 if (i % 2) else 1.0
+      isBad = not (math.sqrt((mx-xExpect)**2 + my*my + mz*mz) < xTol)
+
+      if not (i % 2):
+
+        ### Unit vector from CLOCK toward HOUR
+        hx, hy, hz = posHours[i,0], posHours[i,1], posHours[i,2]
+        hNorm = math.sqrt(hx*hx + hy*hy + hz*hz)
+        hx, hy, hz = hx/hNorm, hy/hNorm, hz/hNorm
+
+        ### Separation angle, with the same well-conditioned formulation
+        ### as VSEP and _vsep
+        if (hx*mx + hy*my + hz*mz) > 0.0:
+          vsep = 2.0 * math.asin(math.sqrt((hx-mx)**2 + (hy-my)**2 + (hz-mz)**2) / 2.0)
+        else:
+          vsep = math.pi - 2.0 * math.asin(math.sqrt((hx+mx)**2 + (hy+my)**2 + (hz+mz)**2) / 2.0)
+        vsepDeg = (180.0 / math.pi) * vsep
+        vsepExpectDeg = (degPerHour * (i >> 1)) % 360.0
+        isBad = isBad or not (abs(vsepDeg - vsepExpectDeg) < xTol
+                              or abs(360.0 - vsepDeg - vsepExpectDeg) < xTol)
+
+      if isBad: nBad += 1
+
+    return nBad
+
+def check_passes_any(posMinutes, posHours, degPerHour, xTol):
+  if useNumba and posMinutes.shape[0] >= nParallelMinPasses:
+    return check_passes_parallel(posMinutes, posHours, degPerHour, xTol)
+  return check_passes(posMinutes, posHours, degPerHour, xTol)
+
+
+########################################################################
+def analytic_events(phase, tstart, tstop, dw):
+  ### Closed-form replacement for a GF search on the angle between the
+  ### hands:  with the hands aligned at t=0 and the minute hand turning
+  ### dw radians/second faster than the hour hand, return the times in
+  ### [tstart,tstop], in ascending order, when (dw * t) mod 2PI == phase
+  k0 = math.ceil((dw*tstart - phase) / (2.0*math.pi))
+  k1 = math.floor((dw*tstop - phase) / (2.0*math.pi))
+  ts = (phase + 2.0*math.pi*np.arange(k0, k1+1)) / dw
+  return ts[(ts >= tstart) & (ts <= tstop)]
+
+if useNumba:
+  ### Compiled equivalent, as an explicit loop, for many repeated queries
+  @njit(cache=True)
+  def analytic_events(phase, tstart, tstop, dw):
+    k0 = int(np.ceil((dw*tstart - phase) / (2.0*np.pi)))
+    k1 = int(np.floor((dw*tstop - phase) / (2.0*np.pi)))
+    ts = np.empty(max(k1-k0+1, 0))
+    for i in range(ts.shape[0]):
+      ts[i] = (phase + 2.0*np.pi*(k0+i)) / dw
+    return ts[(ts >= tstart) & (ts <= tstop)]
+
+
+########################################################################
+def analytic_events_batch(phases, tstart, tstop, dw):
+  ### analytic_events vectorized over an array of phases:  return an
+  ### (nPhases x nK) array of candidate times, and a same-shape mask that
+  ### is True for the times in [tstart,tstop]; both are (0 x 0) if there
+  ### are no phases.  The k range covers the window for every phase, so a
+  ### row may hold a few masked-out times.  At the sizes used here (a few
+  ### phases, ~20 events each) GPU (e.g. JAX) dispatch overhead would
+  ### exceed the arithmetic, so an accelerator is only worth trying for
+  ### ~1e4 or more phases per batch
+  phases = np.asarray(phases, dtype=float).ravel()
+  if 0 == phases.shape[0]:
+    return np.empty((0,0)), np.empty((0,0), dtype=bool)
+  return _analytic_events_batch(phases, float(tstart), float(tstop), float(dw))
+
+def _analytic_events_batch(phases, tstart, tstop, dw):
+  ### Kernel of analytic_events_batch, for a non-empty 1-D phases array
+  k0 = math.floor((dw*tstart - phases.max()) / (2.0*math.pi))
+  k1 = math.ceil((dw*tstop - phases.min()) / (2.0*math.pi))
+  ts = (phases[:,None] + 2.0*math.pi*np.arange(k0, k1+1)[None,:]) / dw
+  return ts, (ts >= tstart) & (ts <= tstop)
+
+if useNumba:
+  ### Compiled equivalent, as explicit loops, of the kernel
+  @njit(cache=True)
+  def _analytic_events_batch(phases, tstart, tstop, dw):
+    k0 = int(np.floor((dw*tstart - phases.max()) / (2.0*np.pi)))
+    k1 = int(np.ceil((dw*tstop - phases.min()) / (2.0*np.pi)))
+    ts = np.empty((phases.shape[0], k1-k0+1))
+    for i in range(ts.shape[0]):
+      for j in range(ts.shape[1]):
+        ts[i,j] = (phases[i] + 2.0*np.pi*(k0+j)) / dw
+    return ts, (ts >= tstart) & (ts <= tstop)
+
 
 ########################################################################
 if "__main__" == __name__:
 
   ### FURNSH (SPICE furnish operation i.e. load kernel ) this script as a kernel,
   ### as well as any command-line arguments
-  ### - skip any argument th at is --debug
-  map(sp.furnsh,[arg for arg in sys.argv if arg != '--debug'])
+  ### - skip any argument th at is --debug or --strict
+  ### - skip duplicate arguments, so no kernel is loaded twice
+  for arg in dict.fromkeys(sys.argv):
+    if arg not in ('--debug', '--strict'):
+      sp.furnsh(arg)
+
+  ### Set strict flag to True if --strict was an argument, else to False
+  doStrict = '--strict' in sys.argv
 
-  ### Set debug flag to True if --debug was an argument, else to False
-  doDebug = '--debug' in sys.argv
+  ### Set debug flag to True if --debug was an argument, else to False;
+  ### --strict only affects the debug GF cross-checks, so implies --debug
+  doDebug = doStrict or '--debug' in sys.argv
 
   ### SPICE names of Clock, minute hand, hour hand
   sClock, sMinute, sHour = sNames = "CLOCK MINUTE HOUR".split()
 
-  ### SPICE works in seconds; get seconds per minute, per hour, per day
-  spm = sp.convrt(1.0, 'minutes', 'seconds')
-  sph = sp.convrt(1.0, 'hours', 'seconds')
-  hpd = sp.convrt(1.0, 'days', 'hours')
-  spd = sp.spd()
+  ### SPICE works in seconds; seconds per minute, per hour, per day, and
+  ### hours per day, are exact, and identical to SPICE CONVRT and SPD
+  spm, sph, hpd, spd = 60.0, 3600.0, 24.0, 86400.0
 
-  ### Other constants:  2*PI; degrees/radian
-  twopi = sp.twopi()
-  dpr = sp.dpr()
+  ### Other constants:  2*PI; degrees/radian; identical to SPICE TWOPI
+  ### and DPR
+  twopi = 2.0 * math.pi
+  dpr = 180.0 / math.pi
 
   ### Get start time (TDB) and SPK filename from kernel pool
   et0 = sp.gdpool('ET0',0,1)[0]
   fnClockSpk = sp.gcpool('CLOCKSPK', 0, 1, 99)[0]
 
-  ### Make clock SPK if it does not exist
-  if not os.path.exists(fnClockSpk):
-
-    ### Orbital period formula:
-    ###
-    ###   T = 2 PI (a*3 / mu))**(1/2)
-    ###
-    ### where
-    ###
-    ###    T = orbital period
-    ###    a = length of semi-major axis
-    ###   mu = GM, standard gravitational parameter
-    ###        => G is the gravitational constant
-    ###        => M is the mass of the more massive body (CLOCK, here)
-    ###
-    ### Solve for a and speed, assuming circular orbit and mu = 1.0:
-    ###
-    ###   a = (T / (2 PI))**(2/3)
-    ###   v = (2 PI a) / T
-    ####    = ((2 PI) / T) * (T / (2 PI))**(2/3)
-    ####    = ((2 PI) / T)**(1/3)
-    ####    = a**(-1/2)
-
-    ### "Period" for minute hand is one hour (sph)
-    aMinute = (sph/twopi) ** (2.0/3.0)
-    spdMinute = aMinute ** (-0.5)
-
-    ### "Period" for hour hand is half a day (spd / 2)
-    aHour = ((spd/2)/twopi) ** (2.0/3.0)
-    spdHour = aHour ** (-0.5)
-
-    ### Get SPICE IDs of clock, and of minute and hour hands
-    iClock, iMinute, iHour = iIds = map(sp.bods2c,sNames)
- 
+  ### Get SPICE IDs of clock, and of minute and hour hands
+  iClock, iMinute, iHour = iIds = [sp.bods2c(sName) for sName in sNames]
+
+  ### Orbital period formula:
+  ###
+  ###   T = 2 PI (a*3 / mu))**(1/2)
+  ###
+  ### where
+  ###
+  ###    T = orbital period
+  ###    a = length of semi-major axis
+  ###   mu = GM, standard gravitational parameter
+  ###        => G is the gravitational constant
+  ###        => M is the mass of the more massive body (CLOCK, here)
+  ###
+  ### Solve for a and speed, assuming circular orbit and mu = 1.0:
+  ###
+  ###   a = (T / (2 PI))**(2/3)
+  ###   v = (2 PI a) / T
+  ####    = ((2 PI) / T) * (T / (2 PI))**(2/3)
+  ####    = ((2 PI) / T)**(1/3)
+  ####    = a**(-1/2)
+
+  ### N.B. these run once per script; for a single Python float, pow is
+  ### as fast as math.cbrt/math.sqrt and faster than NumPy, and changing
+  ### the formulas would change the last bit of the shipped SPK states
+
+  ### "Period" for minute hand is one hour (sph)
+  aMinute = (sph/twopi) ** (2.0/3.0)
+  spdMinute = aMinute ** (-0.5)
+
+  ### "Period" for hour hand is half a day (spd / 2)
+  aHour = ((spd/2)/twopi) ** (2.0/3.0)
+  spdHour = aHour ** (-0.5)
+
+  ### Hash the parameters that determine the clock SPK contents; the hash
+  ### is stored in a sidecar file next to the SPK
+  sParams = json.dumps([aMinute, spdMinute, aHour, spdHour, et0, iIds])
+  sHash = hashlib.sha256(sParams.encode()).hexdigest()
+  fnClockHash = fnClockSpk + '.sha256'
+
+  ### Make clock SPK if it does not exist, or if it was made from different
+  ### parameters
+  doBuild = True
+  if os.path.exists(fnClockSpk) and os.path.exists(fnClockHash):
+    with open(fnClockHash) as fHash:
+      doBuild = fHash.read().strip() != sHash
+
+  if doBuild:
+
+    ### SPKOPN will not overwrite an existing file
+    if os.path.exists(fnClockSpk): os.remove(fnClockSpk)
+
     ### Open new SP-Kernel (SPK; ephemerides of MINUTE and HOUR wrt CLOCK)
     handle = sp.spkopn(fnClockSpk, 'clock_simulation', 0)
 
@@ -131,33 +323,38 @@ if "__main__" == __name__:
 
     ### Store such states at (ET0 - one day) and (ET0 + two days)
 
+    ### The two epochs, and a 2x6 state buffer that is refilled for each
+    ### segment and passed to SPKW05 as-is.  Two SPKW05 calls, made only
+    ### when the parameter hash changes, do not justify a compiled
+    ### (Cython/CFFI) wrapper around CSPICE spkw05_c
+    segEpochs = np.array([-spd, 2*spd])
+    segStates = np.zeros((2,6))
+
+    def writeSegment(iBody, a, v, segId):
+      segStates[:,0] = a                    ### Position along +X
+      segStates[:,4] = v                    ### Velocity along +Y
+      sp.spkw05( handle                     ### SPK handle
+               , iBody, iClock, 'J2000'     ### Body and CLOCK IDs
+               , segEpochs[0], segEpochs[1] ### Segment epoch limits
+               , segId                      ### Segment identifier
+               , 1.0, 2                     ### mu (GM), epoch count
+               , segStates                  ### State at each epoch
+               , segEpochs                  ### epochs
+               )
+
     ### - First segment, MINUTE hand
-    sp.spkw05( handle                              ### SPK handle
-             , iMinute, iClock, 'J2000'            ### MINUTE and CLOCK IDs
-             , -spd, 2*spd                         ### Segment epoch limits
-             , 'minute_orbit'                      ### Segment identifier
-             , 1.0, 2                              ### mu (GM), epoch count
-             , [[aMinute,0.,0.,  0.,spdMinute,0.]  ### First epoch state
-               ,[aMinute,0.,0.,  0.,spdMinute,0.]  ### Second epoch state
-               ]
-             , [-spd,2*spd]                        ### epochs
-             )
+    writeSegment(iMinute, aMinute, spdMinute, 'minute_orbit')
 
     ### - Second segment, HOUR hand
-    sp.spkw05( handle
-             , iHour, iClock, 'J2000'
-             , -spd, 2*spd
-             , 'hour_orbit'
-             , 1.0, 2
-             , [[aHour,0.,0.,  0.,spdHour,0.]
-               ,[aHour,0.,0.,  0.,spdHour,0.]
-               ]
-             , [-spd,2*spd]
-             )
+    writeSegment(iHour, aHour, spdHour, 'hour_orbit')
 
     ### Close SPK
     sp.spkcls(handle)
 
+    ### Save the parameter hash
+    with open(fnClockHash, 'w') as fHash:
+      fHash.write(sHash + '\n')
+
     ### End of clock SPK creation
     ####################################################################
 
@@ -169,33 +366,34 @@ if "__main__" == __name__:
   halfHour = sph / 2.0
   degPerHour = 2.0 * dpr * twopi / hpd
 
-  xTolerance = lambda xDiff: xDiff < 1e-10
-  xDiffTolerance = lambda x,xExpect: xTolerance(abs(x-xExpect))
+  ### Tolerance for unit-vector and angle (degree) comparisons
+  xTol = 1e-10
 
-  et,iPass = et0, 0
-  while et < (et0+spd+1):
+  ### Epochs every half hour, from ET0 through the end of the day:  the
+  ### same nPasses = 49 epochs as stepping et from ET0 while et < ET0+spd+1
+  nPasses = int((spd+1) / halfHour) + 1
+  iPasses = np.arange(nPasses)
+  ets = et0 + halfHour * iPasses
 
-    ### Get the state of the MINUTE and HOUR bodies every half hour
-    stMinute,lt = sp.spkezr(sMinute, et, 'J2000', 'NONE', sClock)
-    stHour,lt = sp.spkezr(sHour, et, 'J2000', 'NONE', sClock)
+  ### Get the states of the MINUTE and HOUR bodies at all epochs into
+  ### preallocated Nx6 arrays; use SPKEZ with the integer IDs to skip the
+  ### name lookups of SPKEZR
+  stMinutes = np.empty((nPasses,6))
+  stHours = np.empty((nPasses,6))
+  for iPass,et in enumerate(ets):
+    stMinutes[iPass,:] = sp.spkez(iMinute, et, 'J2000', 'NONE', iClock)[0]
+    stHours[iPass,:] = sp.spkez(iHour, et, 'J2000', 'NONE', iClock)[0]
 
-    if (iPass % 2):
-      ### On the half hour, the minute hand will be at RA=180, along [-1,0,0]
-      assert xTolerance(sp.vnorm(sp.vsub([-1.0,0.,0.], sp.vhat(stMinute[:3]))))
-    else:
-      ### On the hour, the minute hand will be at RA=0, at [+1,0,0]
-      assert xTolerance(sp.vnorm(sp.vsub([1.0,0.,0.], sp.vhat(stMinute[:3]))))
-      vsepDeg = dpr * sp.vsep(stHour[:3],stMinute[:3])
-      vsepExpectDeg = (degPerHour * (iPass>>1)) % 360
-      ### On the hour, the houre hand will be (30 * iPass) degrees clockwise
-      ### from +X, and therefor also the same from the minute hand
-      assert xDiffTolerance(vsepDeg, vsepExpectDeg) or xDiffTolerance((360 - vsepDeg), vsepExpectDeg)
+  ### Positions are views into the state arrays
+  posMinutes, posHours = stMinutes[:,:3], stHours[:,:3]
 
-    ### Step to next half hour and pass
-    et += halfHour
-    iPass += 1
+  ### On the hour, the minute hand will be at RA=0, at [+1,0,0]
+  ### On the half hour, the minute hand will be at RA=180, along [-1,0,0]
+  ### On the hour, the houre hand will be (30 * iPass) degrees clockwise
+  ### from +X, and therefor also the same from the minute hand
+  assert 0 == check_passes_any(posMinutes, posHours, degPerHour, xTol)
 
-  print('SP-Kernel passed {} half-hour tests'.format(iPass))
+  print('SP-Kernel passed {} half-hour tests'.format(nPasses))
 
   ### End of test
   ######################################################################
@@ -203,63 +401,113 @@ if "__main__" == __name__:
   ### Find classic problem:  how many times in a day the hour and minute
   ### hands are aligned
 
+  ### The hands are aligned at ET0, and the minute hand gains one full
+  ### turn on the hour hand every 2PI/dw seconds, so the events are found
+  ### analytically; the SPICE Geometry Finder (GF) search over the clock
+  ### SPK is only run as a cross-check with --debug
+  dw = twopi/sph - twopi/(spd/2)
+
+  ### GF search step and convergence tolerance, s.  The angle between the
+  ### hands is monotonic over ~32 minutes between extrema, so a 15 minute
+  ### step cannot miss an event, and 1ms convergence is well inside the
+  ### 10ms margins of the confinement windows.  With --strict, use the
+  ### original 1-minute step and 1us convergence
+  gfStep, gfTol = (spm, 1e-6) if doStrict else (sph/4, 1e-3)
+
+  ### Confinement and result windows for the GF cross-checks; allocated
+  ### once, and emptied before each search
   cnfine = sp.stypes.SPICEDOUBLE_CELL(2)
   result = sp.stypes.SPICEDOUBLE_CELL(200)
 
+  def resetSearch(etLeft, etRight):
+    sp.scard(0, cnfine)
+    sp.wninsd(etLeft, etRight, cnfine)
+    sp.scard(0, result)
+
+  ### Result window as an Nx2 array of [left,right] intervals, copied in
+  ### one step from the cell's contiguous data array instead of with one
+  ### WNFETD call per interval.  N.B. this relies on SpiceyPy internals:
+  ### SpiceCell.data is the address of the first data element, past the
+  ### control area, with the interval endpoints stored as consecutive
+  ### doubles
+  def resultIntervals():
+    nWin = sp.wncard(result)
+    cData = (ctypes.c_double * (2*nWin)).from_address(result.data)
+    return np.ctypeslib.as_array(cData).reshape(nWin,2).copy()
+
+  ### Calendar strings, to the millisecond, for debug logging; ETCAL
+  ### truncates, so add half a millisecond to round.  SpiceyPy's ETCAL
+  ### still calls CSPICE once per epoch; this only keeps the formatting
+  ### in one place.  SPICE TIMOUT would need a leapseconds kernel, even
+  ### for TDB output
+  def fmtEts(ets):
+    return sp.etcal(np.asarray(ets) + 0.0005, 99)
+
   ### Set confinement window to 24h at 10ms before two successive midnights
   etStart,etStop = et0 - 10e-3, et0 + spd - 10e-3
-  sp.wninsd(etStart, etStop, cnfine)
 
-  ### Find local minima using SPICE Geometry Finder
-  sp.gfpa(sClock, sMinute, "NONE",  sHour, "LOCMIN", 1e-6
-         , 0.0, spm, 6000, cnfine, result)
+  ### Find alignments, i.e. local minima of the angle between the hands
+  etEvents = et0 + analytic_events(0.0, etStart-et0, etStop-et0, dw)
 
   ### Confirm that 22 minima were found
-  assert 22 == sp.wncard(result)
-  print('SP-Kernel passed [{}-alignments per day] test'.format(sp.wncard(result)))
+  assert 22 == len(etEvents)
+  print('Clock passed [{}-alignments per day] test'.format(len(etEvents)))
 
-  ### Optional logging
+  ### Optional cross-check and logging
   if doDebug:
-    print('Alignments between {} and {}:'.format(sp.etcal(etStart+0.0005,99),sp.etcal(etStop+0.0005,99)))
-    for iWin in range(sp.wncard(result)):
-      left,right = sp.wnfetd(result,iWin)
-      print('  {}:  {}'.format(iWin,sp.etcal(left+0.0005,99)))
+    resetSearch(etStart, etStop)
+    sp.gfpa(sClock, sMinute, "NONE",  sHour, "LOCMIN", gfTol
+           , 0.0, gfStep, 6000, cnfine, result)
+    assert len(etEvents) == sp.wncard(result)
+    assert np.all(np.abs(etEvents - resultIntervals()[:,0]) < 2*gfTol)
+    print('SP-Kernel passed [{}-alignments per day] GF cross-check'.format(sp.wncard(result)))
+
+    print('Alignments between {} and {}:'.format(*fmtEts([etStart,etStop])))
+    for iWin,sLeft in enumerate(fmtEts(etEvents)):
+      print('  {}:  {}'.format(iWin,sLeft))
 
   ### Repeat with extra time
-  cnfine = sp.stypes.SPICEDOUBLE_CELL(2)
   etStop = et0 + spd + 10e-3
-  sp.wninsd(etStart, etStop, cnfine)
 
   ### Find local minima
-  sp.gfpa(sClock, sMinute, "NONE",  sHour, "LOCMIN", 1e-6
-         , 0.0, spm, 6000, cnfine, result)
+  etEvents = et0 + analytic_events(0.0, etStart-et0, etStop-et0, dw)
 
   ### Confirm that 23 minima were found
-  assert 23 == sp.wncard(result)
-  print('SP-Kernel passed [{}-alignments per (day+20ms)] test'.format(sp.wncard(result)))
+  assert 23 == len(etEvents)
+  print('Clock passed [{}-alignments per (day+20ms)] test'.format(len(etEvents)))
 
-  ### Optional logging
+  ### Optional cross-check and logging
   if doDebug:
-    print('Alignments between {} and {}:'.format(sp.etcal(etStart+0.0005,99),sp.etcal(etStop+0.0005,99)))
-    for iWin in range(sp.wncard(result)):
-      left,right = sp.wnfetd(result,iWin)
-      print('  {}:  {}'.format(iWin,sp.etcal(left+0.0005,99)))
-
-  ### Now search for events with a phase angle of 30deg
-  cnfine = sp.stypes.SPICEDOUBLE_CELL(2)
-  sp.wninsd(etStart, etStop, cnfine)
-
-  ### Find local minima
-  sp.gfpa(sClock, sMinute, "NONE",  sHour, "=", 30/dpr
-         , 0.0, spm, 6000, cnfine, result)
+    resetSearch(etStart, etStop)
+    sp.gfpa(sClock, sMinute, "NONE",  sHour, "LOCMIN", gfTol
+           , 0.0, gfStep, 6000, cnfine, result)
+    assert len(etEvents) == sp.wncard(result)
+    assert np.all(np.abs(etEvents - resultIntervals()[:,0]) < 2*gfTol)
+    print('SP-Kernel passed [{}-alignments per (day+20ms)] GF cross-check'.format(sp.wncard(result)))
+
+    print('Alignments between {} and {}:'.format(*fmtEts([etStart,etStop])))
+    for iWin,sLeft in enumerate(fmtEts(etEvents)):
+      print('  {}:  {}'.format(iWin,sLeft))
+
+  ### Now search for events with a phase angle of 30deg, i.e. where the
+  ### minute hand is 30deg ahead of, or 30deg behind, the hour hand
+  phase = 30/dpr
+  ts, isInWindow = analytic_events_batch([phase, twopi-phase], etStart-et0, etStop-et0, dw)
+  etEvents = et0 + np.sort(ts[isInWindow])
 
   ### Confirm that 44 matching events were found
-  assert 44 == sp.wncard(result)
-  print('SP-Kernel passed [{}-30-deg-alignments per (day+20ms)] test'.format(sp.wncard(result)))
+  assert 44 == len(etEvents)
+  print('Clock passed [{}-30-deg-alignments per (day+20ms)] test'.format(len(etEvents)))
 
-  ### Optional logging
+  ### Optional cross-check and logging
   if doDebug:
-    print('30deg events between {} and {}:'.format(sp.etcal(etStart+0.0005,99),sp.etcal(etStop+0.0005,99)))
-    for iWin in range(sp.wncard(result)):
-      left,right = sp.wnfetd(result,iWin)
-      print('  {}:  {}'.format(iWin,sp.etcal(left+0.0005,99)))
+    resetSearch(etStart, etStop)
+    sp.gfpa(sClock, sMinute, "NONE",  sHour, "=", phase
+           , 0.0, gfStep, 6000, cnfine, result)
+    assert len(etEvents) == sp.wncard(result)
+    assert np.all(np.abs(etEvents - resultIntervals()[:,0]) < 2*gfTol)
+    print('SP-Kernel passed [{}-30-deg-alignments per (day+20ms)] GF cross-check'.format(sp.wncard(result)))
+
+    print('30deg events between {} and {}:'.format(*fmtEts([etStart,etStop])))
+    for iWin,sLeft in enumerate(fmtEts(etEvents)):
+      print('  {}:  {}'.format(iWin,sLeft))